@@ -13,6 +13,10 @@ BEDROCK_TEMPERATURE = float(os.environ.get("BEDROCK_TEMPERATURE", "0.3"))
 # Set ENABLE_TTS=true in .env to turn on audio responses
 ENABLE_TTS = os.environ.get("ENABLE_TTS", "false").lower() == "true"
 
+# RTI drafting — render templated categories locally instead of making a
+# second Bedrock call. Set RTI_TEMPLATE_FAST_PATH=false to always draft via AI.
+RTI_TEMPLATE_FAST_PATH = os.environ.get("RTI_TEMPLATE_FAST_PATH", "true").lower() == "true"
+
 # DynamoDB
 USERS_TABLE = os.environ.get("USERS_TABLE", "loksarthi-users")
 SESSIONS_TABLE = os.environ.get("SESSIONS_TABLE", "loksarthi-sessions")
@@ -1,42 +1,69 @@
 """Amazon Bedrock client — core AI engine using Amazon Nova Micro."""
-import json
+import functools
+import hashlib
+import re
+import time
+from collections import OrderedDict
+
+import orjson
 import boto3
 from botocore.config import Config as BotoConfig
 from app.config import AWS_REGION, BEDROCK_MODEL_ID, BEDROCK_MAX_TOKENS, BEDROCK_TEMPERATURE
 
-# Initialize Bedrock client with timeout (reused across invocations)
-_bedrock_client = None
+# Bedrock client built at import time — in Lambda this puts the ~0.5-1s
+# client construction in the free init phase instead of the first request
+# tcp_keepalive stops idle warm Lambdas from dropping the HTTPS connection
+# and paying a fresh TLS handshake on the next invocation
+_cfg = BotoConfig(
+    connect_timeout=10,
+    read_timeout=30,
+    retries={"max_attempts": 1},
+    tcp_keepalive=True,
+    max_pool_connections=10,
+)
+_bedrock_client = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=_cfg)
 
 
 def get_bedrock_client():
-    global _bedrock_client
-    if _bedrock_client is None:
-        cfg = BotoConfig(connect_timeout=10, read_timeout=30, retries={"max_attempts": 1})
-        _bedrock_client = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=cfg)
     return _bedrock_client
 
 
-def invoke_model(system_prompt: str, user_message: str, conversation_history: list = None) -> str:
-    """
-    Invoke the configured Bedrock model with system prompt and conversation context.
+# Invariant request-body pieces, built once at import instead of per call
+_NOVA_INFERENCE_CONFIG = {
+    "maxTokens": BEDROCK_MAX_TOKENS,
+    "temperature": BEDROCK_TEMPERATURE,
+}
 
-    Supports Amazon Nova (default) and Claude API formats automatically.
 
-    Args:
-        system_prompt: System-level instructions
-        user_message: Current user message
-        conversation_history: Previous messages [{role, content}]
+def _trim_history(history: list, max_chars: int = 2000) -> list:
+    """Keep the newest messages whose combined content fits in max_chars.
 
-    Returns:
-        Model's response text
+    A size budget instead of a fixed message count: short yes/no turns
+    keep more context while a single multi-KB message doesn't blow up the
+    input-token bill. Always keeps at least the newest message.
     """
-    client = get_bedrock_client()
+    kept = []
+    total = 0
+    for msg in reversed(history):
+        content = msg["content"]
+        size = (len(content) if isinstance(content, str)
+                else sum(len(block.get("text", "")) for block in content))
+        if kept and total + size > max_chars:
+            break
+        kept.append(msg)
+        total += size
+    kept.reverse()
+    return kept
+
+
+def _build_body(system_prompt: str, user_message: str, conversation_history: list = None):
+    """Build the serialized request body. Returns (body_bytes, is_claude)."""
     model_id = BEDROCK_MODEL_ID
 
-    # Build messages with history for context
+    # Build messages with history for context, newest-first within a size budget
     messages = []
     if conversation_history:
-        for msg in conversation_history[-2:]:  # Last 2 messages — saves input tokens
+        for msg in _trim_history(conversation_history):
             content = msg["content"]
             # Nova expects content as list of text blocks
             if isinstance(content, str):
@@ -46,10 +73,9 @@ def invoke_model(system_prompt: str, user_message: str, conversation_history: li
     # Add current user message
     messages.append({"role": "user", "content": [{"text": user_message}]})
 
-    # Use Amazon Nova / Converse API format
     if "claude" in model_id or "anthropic" in model_id:
         # Claude format (fallback if user switches back)
-        body = json.dumps({
+        body = orjson.dumps({
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": BEDROCK_MAX_TOKENS,
             "temperature": BEDROCK_TEMPERATURE,
@@ -58,28 +84,88 @@ def invoke_model(system_prompt: str, user_message: str, conversation_history: li
                           if isinstance(m["content"], list) else m["content"]}
                          for m in messages],
         })
-        response = client.invoke_model(
-            modelId=model_id, contentType="application/json",
-            accept="application/json", body=body,
-        )
-        result = json.loads(response["body"].read())
-        return result["content"][0]["text"]
-    else:
-        # Amazon Nova format (Converse API)
-        body = json.dumps({
-            "system": [{"text": system_prompt}],
-            "messages": messages,
-            "inferenceConfig": {
-                "maxTokens": BEDROCK_MAX_TOKENS,
-                "temperature": BEDROCK_TEMPERATURE,
-            },
-        })
-        response = client.invoke_model(
-            modelId=model_id, contentType="application/json",
-            accept="application/json", body=body,
-        )
-        result = json.loads(response["body"].read())
-        return result["output"]["message"]["content"][0]["text"]
+        return body, True
+
+    # Amazon Nova format (Converse API)
+    body = orjson.dumps({
+        "system": [{"text": system_prompt}],
+        "messages": messages,
+        "inferenceConfig": _NOVA_INFERENCE_CONFIG,
+    })
+    return body, False
+
+
+def invoke_model_stream(system_prompt: str, user_message: str, conversation_history: list = None):
+    """
+    Invoke the configured Bedrock model and yield text chunks as they are
+    generated, via invoke_model_with_response_stream.
+
+    Supports Amazon Nova (default) and Claude event formats automatically.
+    """
+    body, is_claude = _build_body(system_prompt, user_message, conversation_history)
+    yield from _stream_from_body(body, is_claude)
+
+
+def _stream_from_body(body: bytes, is_claude: bool):
+    """Stream text deltas for an already-serialized request body."""
+    client = get_bedrock_client()
+    response = client.invoke_model_with_response_stream(
+        modelId=BEDROCK_MODEL_ID, contentType="application/json",
+        accept="application/json", body=body,
+    )
+    for event in response["body"]:
+        chunk = orjson.loads(event["chunk"]["bytes"])
+        if is_claude:
+            if chunk.get("type") == "content_block_delta":
+                text = chunk.get("delta", {}).get("text")
+                if text:
+                    yield text
+        else:
+            text = chunk.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                yield text
+
+
+def invoke_model(system_prompt: str, user_message: str, conversation_history: list = None) -> str:
+    """
+    Invoke the configured Bedrock model with system prompt and conversation context.
+
+    Supports Amazon Nova (default) and Claude API formats automatically.
+    Consumes the response stream chunk-by-chunk rather than blocking on the
+    full body, so network receive overlaps generation.
+
+    Args:
+        system_prompt: System-level instructions
+        user_message: Current user message
+        conversation_history: Previous messages [{role, content}]
+
+    Returns:
+        Model's response text
+    """
+    body, is_claude = _build_body(system_prompt, user_message, conversation_history)
+
+    # Dedupe identical request bodies (client retries, double-taps): a short
+    # TTL means repeats within a minute reuse the generation for free
+    key = hashlib.blake2b(body, digest_size=16).digest()
+    now = time.monotonic()
+    cached = _invoke_cache.get(key)
+    if cached is not None and cached[0] > now:
+        _invoke_cache.move_to_end(key)
+        return cached[1]
+
+    text = "".join(_stream_from_body(body, is_claude))
+
+    _invoke_cache[key] = (now + _INVOKE_CACHE_TTL, text)
+    _invoke_cache.move_to_end(key)
+    while len(_invoke_cache) > _INVOKE_CACHE_MAX:
+        _invoke_cache.popitem(last=False)
+    return text
+
+
+# Bounded LRU of recent generations keyed by request-body hash
+_invoke_cache: OrderedDict = OrderedDict()
+_INVOKE_CACHE_TTL = 60.0
+_INVOKE_CACHE_MAX = 512
 
 
 # Keep backward-compatible alias
@@ -109,6 +195,20 @@ _FINANCIAL_KEYWORDS = {
 }
 
 
+# Profile fragments ("age 35", "35 \u0938\u093e\u0932", "main kisan hoon") \u2014 precompiled so the
+# prefilter costs microseconds, not a Bedrock round-trip
+_AGE_RE = re.compile(r"\b(1[0-9]|[2-9][0-9])\s*(?:\u0938\u093e\u0932|sal|saal|years?|yrs?|\u0935\u0930\u094d\u0937)\b")
+_AGE_PREFIX_RE = re.compile(r"(?:age|\u0909\u092e\u094d\u0930|umar|umra)\s*(?:is|hai|\u0939\u0948)?\s*(1[0-9]|[2-9][0-9])\b")
+_OCCUPATION_KEYWORDS = {
+    "\u0915\u093f\u0938\u093e\u0928": "farmer", "kisan": "farmer", "farmer": "farmer", "\u0916\u0947\u0924\u0940": "farmer",
+    "\u092e\u091c\u093c\u0926\u0942\u0930": "labourer", "\u092e\u091c\u0926\u0942\u0930": "labourer", "mazdoor": "labourer", "labourer": "labourer",
+    "\u0926\u0941\u0915\u093e\u0928\u0926\u093e\u0930": "vendor", "dukandar": "vendor", "vendor": "vendor", "shopkeeper": "vendor",
+    "\u091b\u093e\u0924\u094d\u0930": "student", "student": "student", "\u0935\u093f\u0926\u094d\u092f\u093e\u0930\u094d\u0925\u0940": "student",
+    "\u0917\u0943\u0939\u093f\u0923\u0940": "homemaker", "housewife": "homemaker", "homemaker": "homemaker",
+    "\u092c\u0947\u0930\u094b\u091c\u093c\u0917\u093e\u0930": "unemployed", "berozgar": "unemployed", "unemployed": "unemployed",
+}
+
+
 def _quick_classify(text: str) -> dict | None:
     """Return a result dict without calling Bedrock if intent is obvious."""
     lower = text.lower().strip()
@@ -124,6 +224,19 @@ def _quick_classify(text: str) -> dict | None:
     if len(lower) < 30 and (_hits(_GREETING_KEYWORDS) or lower in {"?", ".", ""}):
         return {"intent": "greeting", "profile_updates": {}, "language_detected": lang}
 
+    # Obvious profile fragments \u2014 short messages that just state age/occupation
+    if len(lower) < 40:
+        updates = {}
+        age_match = _AGE_RE.search(lower) or _AGE_PREFIX_RE.search(lower)
+        if age_match:
+            updates["age"] = int(age_match.group(1))
+        for kw, occ in _OCCUPATION_KEYWORDS.items():
+            if kw in lower:
+                updates["occupation"] = occ
+                break
+        if updates:
+            return {"intent": "profile_update", "profile_updates": updates, "language_detected": lang}
+
     if _hits(_RTI_KEYWORDS):
         return {"intent": "rti", "profile_updates": {}, "language_detected": lang}
 
@@ -136,6 +249,18 @@ def _quick_classify(text: str) -> dict | None:
     return None  # Unclear — fall through to Bedrock
 
 
+# Intent-classifier instructions never change — build the string once
+INTENT_SYSTEM_PROMPT = (
+    "You are LokSarthi's intent classifier. Analyze the message and return JSON only.\n"
+    "INTENTS: greeting | scheme_discovery | rti | financial | profile_update\n"
+    "PROFILE FIELDS: age(int), gender, state, occupation, category, "
+    "annual_income(int), bpl_status(bool), disability(bool), marital_status, "
+    "land_ownership(bool), education_level, family_members(int), children_count(int)\n"
+    "Reply ONLY with valid JSON: "
+    '{"intent": "...", "profile_updates": {...}, "language_detected": "hi|en|..."}'
+)
+
+
 def detect_intent(user_message: str, conversation_history: list = None) -> dict:
     """
     Detect user intent and extract profile information from the message.
@@ -153,23 +278,34 @@ def detect_intent(user_message: str, conversation_history: list = None) -> dict:
     if quick is not None:
         return quick
 
-    # Fall back to Bedrock for ambiguous messages
-    system_prompt = (
-        "You are LokSarthi's intent classifier. Analyze the message and return JSON only.\n"
-        "INTENTS: greeting | scheme_discovery | rti | financial | profile_update\n"
-        "PROFILE FIELDS: age(int), gender, state, occupation, category, "
-        "annual_income(int), bpl_status(bool), disability(bool), marital_status, "
-        "land_ownership(bool), education_level, family_members(int), children_count(int)\n"
-        "Reply ONLY with valid JSON: "
-        '{"intent": "...", "profile_updates": {...}, "language_detected": "hi|en|..."}'
-    )
+    # Short answers ("haan", "yes", numbers) repeat a lot within and across
+    # sessions — serve repeats from a bounded LRU instead of Bedrock
+    normalized = user_message.strip().lower()
+    if len(normalized) <= 64:
+        return dict(_cached_bedrock_intent(normalized))
+
+    return _bedrock_intent(user_message, conversation_history)
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_bedrock_intent(normalized_message: str) -> dict:
+    """Bedrock classification memoized on the normalized short message."""
+    return _bedrock_intent(normalized_message, None)
+
+
+# Strips ```json ... ``` fences in one match instead of three split copies
+_JSON_FENCE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?```\s*$", re.DOTALL)
+
 
+def _bedrock_intent(user_message: str, conversation_history: list = None) -> dict:
+    """Classify via Bedrock — the expensive fallback path."""
     try:
-        response = invoke_model(system_prompt, user_message, conversation_history)
+        response = invoke_model(INTENT_SYSTEM_PROMPT, user_message, conversation_history)
         clean = response.strip()
-        if clean.startswith("```"):
-            clean = clean.split("\n", 1)[1].rsplit("```", 1)[0]
-        return json.loads(clean)
+        fence = _JSON_FENCE.match(clean)
+        if fence:
+            clean = fence.group(1)
+        return orjson.loads(clean)
     except Exception as e:
         print(f"Bedrock intent detection failed, using fallback: {e}")
         # Smart fallback — guess intent from language
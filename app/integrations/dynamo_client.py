@@ -1,40 +1,85 @@
-"""DynamoDB client for session and user management."""
+"""DynamoDB client for session and user management.
+
+Uses the low-level client with hand-written AttributeValue encoding —
+bypasses boto3.resource's TypeSerializer/TypeDeserializer pass (and its
+Decimal juggling) on every get_item/put_item.
+"""
+import os
 import time
-import json
 import boto3
-from boto3.dynamodb.conditions import Key
-from decimal import Decimal
+import orjson
+from botocore.config import Config as BotoConfig
 from app.config import AWS_REGION, SESSIONS_TABLE, USERS_TABLE, SESSION_TTL_SECONDS, USER_TTL_SECONDS
 from app.models.schemas import Session, CitizenProfile
 
-# Initialize DynamoDB (reused for Lambda warm starts)
-_dynamodb = None
+# DynamoDB client built at import time — cold-start cost lands in the free
+# Lambda init phase, not the first invocation. tcp_keepalive keeps the warm
+# HTTPS connection alive across idle periods (no repeat TLS handshake).
+_cfg = BotoConfig(
+    connect_timeout=2,
+    read_timeout=10,
+    retries={"max_attempts": 2, "mode": "adaptive"},
+    tcp_keepalive=True,
+    max_pool_connections=10,
+)
+_dynamodb = boto3.client("dynamodb", region_name=AWS_REGION, config=_cfg)
+
+
+def _warmup():
+    """Pre-open the HTTPS connection during Lambda init so the first real
+    request doesn't pay for TCP + TLS + SigV4. Never fails boot."""
+    try:
+        _dynamodb.describe_endpoints()
+    except Exception:
+        pass
 
 
-def get_dynamodb():
-    global _dynamodb
-    if _dynamodb is None:
-        _dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-    return _dynamodb
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    _warmup()
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Handle DynamoDB Decimal types."""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super().default(obj)
+def get_dynamodb():
+    return _dynamodb
 
 
-def _convert_floats(obj):
-    """Convert floats to Decimal for DynamoDB."""
-    if isinstance(obj, float):
-        return Decimal(str(obj))
-    elif isinstance(obj, dict):
-        return {k: _convert_floats(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_floats(i) for i in obj]
-    return obj
+def _encode_av(value):
+    """Encode a Python value as a DynamoDB AttributeValue."""
+    if isinstance(value, bool):          # bool before int — bool is an int subclass
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, dict):
+        return {"M": {k: _encode_av(v) for k, v in value.items()}}
+    if isinstance(value, list):
+        return {"L": [_encode_av(v) for v in value]}
+    raise TypeError(f"Unsupported DynamoDB type: {type(value)}")
+
+
+def _decode_av(av: dict):
+    """Decode a DynamoDB AttributeValue into a native Python value."""
+    if "S" in av:
+        return av["S"]
+    if "N" in av:
+        n = av["N"]
+        return float(n) if "." in n or "e" in n or "E" in n else int(n)
+    if "BOOL" in av:
+        return av["BOOL"]
+    if "NULL" in av:
+        return None
+    if "M" in av:
+        return {k: _decode_av(v) for k, v in av["M"].items()}
+    if "L" in av:
+        return [_decode_av(v) for v in av["L"]]
+    raise TypeError(f"Unsupported AttributeValue: {av}")
+
+
+# conversation_history / matched_schemes are stored as a single JSON string
+# attribute — one orjson pass instead of a deep AttributeValue tree
+_JSON_FIELDS = ("conversation_history", "matched_schemes")
 
 
 # In-memory session cache — avoids a DynamoDB read on every request
@@ -47,11 +92,18 @@ def get_session(session_id: str) -> Session:
     if session_id in _session_cache:
         return _session_cache[session_id]
 
-    table = get_dynamodb().Table(SESSIONS_TABLE)
+    client = get_dynamodb()
     try:
-        response = table.get_item(Key={"session_id": session_id})
+        response = client.get_item(
+            TableName=SESSIONS_TABLE,
+            Key={"session_id": {"S": session_id}},
+        )
         if "Item" in response:
-            item = json.loads(json.dumps(response["Item"], cls=DecimalEncoder))
+            item = {k: _decode_av(v) for k, v in response["Item"].items()}
+            # New items pack these as JSON strings; old items stored lists
+            for f in _JSON_FIELDS:
+                if isinstance(item.get(f), str):
+                    item[f] = orjson.loads(item[f])
             session = Session.from_dict(item)
             _session_cache[session_id] = session
             return session
@@ -65,18 +117,101 @@ def get_session(session_id: str) -> Session:
 
 
 def save_session(session: Session):
-    """Save session to DynamoDB with TTL."""
-    table = get_dynamodb().Table(SESSIONS_TABLE)
-    item = session.to_dict()
-    item["ttl"] = int(time.time()) + SESSION_TTL_SECONDS
+    """Save session to DynamoDB with TTL.
 
-    # Convert floats to Decimal
-    item = _convert_floats(item)
+    Uses UpdateItem with an explicit SET expression so only the mutable
+    fields go on the wire — created_at is written once via if_not_exists
+    instead of re-sending the whole item every turn.
+    """
+    client = get_dynamodb()
+    item = session.to_dict()
 
-    table.put_item(Item=item)
+    client.update_item(
+        TableName=SESSIONS_TABLE,
+        Key={"session_id": {"S": session.session_id}},
+        UpdateExpression=(
+            "SET conversation_history = :h, matched_schemes = :m, "
+            "profile = :pr, #lang = :l, current_pillar = :p, "
+            "user_id = :uid, updated_at = :u, "
+            "created_at = if_not_exists(created_at, :c), #ttl = :t"
+        ),
+        # "language" and "ttl" are DynamoDB reserved words
+        ExpressionAttributeNames={"#lang": "language", "#ttl": "ttl"},
+        ExpressionAttributeValues={
+            ":h": {"S": orjson.dumps(item["conversation_history"]).decode()},
+            ":m": {"S": orjson.dumps(item["matched_schemes"]).decode()},
+            ":pr": _encode_av(item["profile"]),
+            ":l": {"S": item["language"]},
+            ":p": {"S": item["current_pillar"]},
+            ":uid": _encode_av(item["user_id"]),
+            ":u": {"N": str(item["updated_at"])},
+            ":c": {"N": str(item["created_at"])},
+            ":t": {"N": str(int(time.time()) + SESSION_TTL_SECONDS)},
+        },
+    )
+
+
+def _session_item(session: Session) -> dict:
+    """Build the full session item as an AttributeValue map (for batch puts)."""
+    item = session.to_dict()
+    item["ttl"] = int(time.time()) + SESSION_TTL_SECONDS
+    av_item = {}
+    for k, v in item.items():
+        if k in _JSON_FIELDS:
+            av_item[k] = {"S": orjson.dumps(v).decode()}
+        else:
+            av_item[k] = _encode_av(v)
+    return av_item
+
+
+def _user_item(session: Session) -> dict:
+    """Build a user-profile snapshot item keyed by user_id."""
+    return {
+        "user_id": {"S": session.user_id},
+        "profile": _encode_av(session.profile.to_dict()),
+        "language": {"S": session.language},
+        "updated_at": {"N": str(session.updated_at)},
+        "ttl": {"N": str(int(time.time()) + USER_TTL_SECONDS)},
+    }
+
+
+def _batches_of(n: int, items: list):
+    """Yield successive chunks of at most n items."""
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
+
+
+def batch_write(request_items: dict):
+    """BatchWriteItem wrapper — enforces the 25-request API cap per call and
+    resubmits UnprocessedItems a few times before giving up."""
+    client = get_dynamodb()
+    flat = [(table, req) for table, reqs in request_items.items() for req in reqs]
+    for chunk in _batches_of(25, flat):
+        pending = {}
+        for table, req in chunk:
+            pending.setdefault(table, []).append(req)
+        for _ in range(3):
+            response = client.batch_write_item(RequestItems=pending)
+            pending = response.get("UnprocessedItems") or {}
+            if not pending:
+                break
+
+
+def batch_save(session: Session):
+    """Save the session and (when user_id is set) a user-profile snapshot in
+    a single BatchWriteItem round-trip instead of two sequential writes."""
+    request_items = {
+        SESSIONS_TABLE: [{"PutRequest": {"Item": _session_item(session)}}],
+    }
+    if session.user_id:
+        request_items[USERS_TABLE] = [{"PutRequest": {"Item": _user_item(session)}}]
+    batch_write(request_items)
 
 
 def delete_session(session_id: str):
     """Delete a session (right to erasure)."""
-    table = get_dynamodb().Table(SESSIONS_TABLE)
-    table.delete_item(Key={"session_id": session_id})
+    client = get_dynamodb()
+    client.delete_item(
+        TableName=SESSIONS_TABLE,
+        Key={"session_id": {"S": session_id}},
+    )
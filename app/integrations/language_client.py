@@ -4,26 +4,47 @@ import base64
 import json
 import time
 import os
+from botocore.config import Config as BotoConfig
 from app.config import AWS_REGION, SUPPORTED_LANGUAGES
 
-# AWS clients (reused for Lambda warm starts)
-_translate_client = None
-_polly_client = None
-_transcribe_client = None
-_s3_client = None
+# AWS clients built at import time (Lambda init phase) and reused for the
+# lifetime of the process — detect_language previously constructed a fresh
+# Comprehend client on every call. tcp_keepalive avoids a fresh TLS
+# handshake after the Lambda sits idle.
+_cfg = BotoConfig(
+    connect_timeout=2,
+    read_timeout=10,
+    retries={"max_attempts": 2, "mode": "adaptive"},
+    tcp_keepalive=True,
+    max_pool_connections=10,
+)
+_translate_client = boto3.client("translate", region_name=AWS_REGION, config=_cfg)
+_polly_client = boto3.client("polly", region_name=AWS_REGION, config=_cfg)
+_comprehend_client = boto3.client("comprehend", region_name=AWS_REGION, config=_cfg)
+
+
+def _warmup():
+    """Pre-open HTTPS connections during Lambda init (the free phase) so the
+    first user turn doesn't pay for TCP + TLS + SigV4. Never fails boot."""
+    try:
+        _translate_client.list_languages(MaxResults=1)
+    except Exception:
+        pass
+    try:
+        _polly_client.describe_voices(LanguageCode="hi-IN")
+    except Exception:
+        pass
+
+
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    _warmup()
 
 
 def get_translate_client():
-    global _translate_client
-    if _translate_client is None:
-        _translate_client = boto3.client("translate", region_name=AWS_REGION)
     return _translate_client
 
 
 def get_polly_client():
-    global _polly_client
-    if _polly_client is None:
-        _polly_client = boto3.client("polly", region_name=AWS_REGION)
     return _polly_client
 
 
@@ -41,10 +62,13 @@ AWS_LANGUAGE_CODES = {
     "pa": "pa",
 }
 
-# Polly voice IDs for Indian languages
+# Polly voice IDs for Indian languages — Kajal (neural) speaks both hi-IN
+# and en-IN natively, so responses are synthesized directly without any
+# translate-to-Hindi detour. Polly has no Tamil/Telugu/Bengali voices yet;
+# those languages fall back to the Hindi voice.
 POLLY_VOICES = {
-    "hi": {"voice": "Aditi", "lang_code": "hi-IN"},
-    "en": {"voice": "Aditi", "lang_code": "en-IN"},
+    "hi": {"voice": "Kajal", "lang_code": "hi-IN", "engine": "neural"},
+    "en": {"voice": "Kajal", "lang_code": "en-IN", "engine": "neural"},
 }
 
 
@@ -96,15 +120,27 @@ def text_to_speech(text: str, language: str = "hi") -> str:
     voice_info = POLLY_VOICES.get(language, POLLY_VOICES["hi"])
     voice_id = voice_info["voice"]
     lang_code = voice_info["lang_code"]
+    engine = voice_info.get("engine", "standard")
 
     try:
-        response = client.synthesize_speech(
-            Text=text[:3000],  # Polly limit
-            OutputFormat="mp3",
-            VoiceId=voice_id,
-            LanguageCode=lang_code,
-            Engine="standard",
-        )
+        try:
+            response = client.synthesize_speech(
+                Text=text[:3000],  # Polly limit
+                OutputFormat="mp3",
+                VoiceId=voice_id,
+                LanguageCode=lang_code,
+                Engine=engine,
+            )
+        except Exception:
+            # Neural voices aren't available in every region — retry with
+            # the standard Aditi voice before giving up
+            response = client.synthesize_speech(
+                Text=text[:3000],
+                OutputFormat="mp3",
+                VoiceId="Aditi",
+                LanguageCode=lang_code,
+                Engine="standard",
+            )
 
         audio_bytes = response["AudioStream"].read()
         return base64.b64encode(audio_bytes).decode("utf-8")
@@ -124,8 +160,7 @@ def detect_language(text: str) -> str:
         Language code (e.g., "hi", "en")
     """
     try:
-        client = boto3.client("comprehend", region_name=AWS_REGION)
-        response = client.detect_dominant_language(Text=text[:500])
+        response = _comprehend_client.detect_dominant_language(Text=text[:500])
         languages = response.get("Languages", [])
         if languages:
             detected = languages[0]["LanguageCode"]
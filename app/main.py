@@ -1,10 +1,9 @@
 """LokSarthi — FastAPI Application + Lambda Handler."""
-import json
 import os
 import uuid
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+import orjson
+from fastapi import BackgroundTasks, FastAPI, Request
+from fastapi.responses import ORJSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from mangum import Mangum
 
@@ -12,21 +11,41 @@ from app.orchestrator import process_message
 from app.models.schemas import Session
 from app.integrations.dynamo_client import get_session, save_session, delete_session
 
+
+def _save_session_safe(session: Session):
+    """Background session save — fails silently when DynamoDB isn't set up."""
+    try:
+        save_session(session)
+    except Exception as e:
+        print(f"Session save skipped (DynamoDB not available): {e}")
+
+
 # FastAPI app
 app = FastAPI(
     title="LokSarthi API",
     description="AI-powered voice-first multilingual citizen services platform",
     version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson is ~3-10x faster than stdlib json
 )
 
-# CORS for frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS for frontend — the wildcard policy never varies per request, so a
+# tiny middleware appending precomputed headers replaces CORSMiddleware's
+# per-request origin matching. Preflights short-circuit with a 204.
+_CORS_HEADERS = {
+    "access-control-allow-origin": "*",
+    "access-control-allow-methods": "*",
+    "access-control-allow-headers": "*",
+    "access-control-max-age": "600",
+}
+
+
+@app.middleware("http")
+async def cors_headers(request: Request, call_next):
+    if request.method == "OPTIONS":
+        return Response(status_code=204, headers=_CORS_HEADERS)
+    response = await call_next(request)
+    response.headers.update(_CORS_HEADERS)
+    return response
 
 # Serve frontend assets — mount css/ and js/ so relative paths work from root
 from pathlib import Path
@@ -49,7 +68,7 @@ async def health_check():
 
 
 @app.post("/api/chat")
-async def chat(request: Request):
+async def chat(request: Request, background_tasks: BackgroundTasks):
     """
     Main chat endpoint — handles text-based conversation.
 
@@ -73,14 +92,14 @@ async def chat(request: Request):
     try:
         body = await request.json()
     except Exception:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={"error": "Invalid JSON body"}
         )
 
     message = body.get("message", "").strip()
     if not message:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={"error": "Message is required"}
         )
@@ -97,10 +116,10 @@ async def chat(request: Request):
 
     # Process message through orchestrator
     try:
-        result = process_message(session, message)
+        result = await process_message(session, message)
     except Exception as e:
         print(f"Orchestrator error: {e}")
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "text": "Sorry, something went wrong. Please try again. / कुछ गलत हो गया, कृपया दोबारा कोशिश करें।",
             "audio_base64": None,
             "language": session.language,
@@ -109,15 +128,13 @@ async def chat(request: Request):
             "schemes": [],
         })
 
-    # Save updated session (fail silently — DynamoDB may not be set up locally)
+    # Persist the session after the response is sent — the client doesn't
+    # need to wait for the DynamoDB write
     updated_session = result.pop("session")
-    try:
-        save_session(updated_session)
-    except Exception as e:
-        print(f"Session save skipped (DynamoDB not available): {e}")
+    background_tasks.add_task(_save_session_safe, updated_session)
 
     # Return response
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "text": result["text"],
         "audio_base64": result.get("audio_base64"),
         "language": result["language"],
@@ -142,18 +159,18 @@ async def voice_input(request: Request):
     try:
         body = await request.json()
     except Exception:
-        return JSONResponse(status_code=400, content={"error": "Invalid JSON body"})
+        return ORJSONResponse(status_code=400, content={"error": "Invalid JSON body"})
 
     audio_base64 = body.get("audio_base64")
     if not audio_base64:
-        return JSONResponse(status_code=400, content={"error": "audio_base64 is required"})
+        return ORJSONResponse(status_code=400, content={"error": "audio_base64 is required"})
 
     session_id = body.get("session_id", str(uuid.uuid4()))
     language = body.get("language", "hi")
 
     # For now, return a message asking to use text input
     # Full Transcribe integration requires S3 upload + async transcription
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "text": "Voice input received. Please use text input for now — voice transcription will be available soon.",
         "audio_base64": None,
         "language": language,
@@ -164,36 +181,39 @@ async def voice_input(request: Request):
     })
 
 
+# Scheme catalog is static — load, trim and serialize it once at import so
+# /api/schemes serves pre-built bytes with zero per-request work
+_schemes_path = os.path.join(os.path.dirname(__file__), "data", "schemes", "central_schemes.json")
+with open(_schemes_path, "rb") as f:
+    _schemes_raw = orjson.loads(f.read())
+_SCHEMES_RESPONSE_BYTES = orjson.dumps({
+    "total": len(_schemes_raw),
+    "schemes": [
+        {
+            "id": s["scheme_id"],
+            "name": s["name"],
+            "name_hi": s.get("name_hi", ""),
+            "benefit": s["benefit_amount"],
+            "ministry": s.get("ministry", ""),
+            "type": s.get("benefit_type", ""),
+            "apply_url": s.get("apply_url", ""),
+        }
+        for s in _schemes_raw
+    ],
+})
+
+
 @app.get("/api/schemes")
 async def list_schemes():
     """List all available government schemes."""
-    import os
-    schemes_path = os.path.join(os.path.dirname(__file__), "data", "schemes", "central_schemes.json")
-    with open(schemes_path, "r", encoding="utf-8") as f:
-        schemes = json.load(f)
-
-    return JSONResponse(content={
-        "total": len(schemes),
-        "schemes": [
-            {
-                "id": s["scheme_id"],
-                "name": s["name"],
-                "name_hi": s.get("name_hi", ""),
-                "benefit": s["benefit_amount"],
-                "ministry": s.get("ministry", ""),
-                "type": s.get("benefit_type", ""),
-                "apply_url": s.get("apply_url", ""),
-            }
-            for s in schemes
-        ]
-    })
+    return Response(content=_SCHEMES_RESPONSE_BYTES, media_type="application/json")
 
 
 @app.delete("/api/session/{session_id}")
 async def delete_user_session(session_id: str):
     """Delete a session — right to erasure (DPDP Act compliance)."""
     delete_session(session_id)
-    return JSONResponse(content={"status": "deleted", "session_id": session_id})
+    return ORJSONResponse(content={"status": "deleted", "session_id": session_id})
 
 
 # Lambda handler via Mangum
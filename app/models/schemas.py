@@ -1,11 +1,13 @@
 """Data models for LokSarthi — Citizen profiles, schemes, sessions."""
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from typing import Optional
 import time
 import uuid
 
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class CitizenProfile:
     """Represents a citizen's profile extracted from conversation."""
     age: Optional[int] = None
@@ -26,6 +28,11 @@ class CitizenProfile:
     pregnant_in_family: Optional[bool] = None
     senior_in_family: Optional[bool] = None
 
+    # Serialized-JSON cache — handlers embed the profile in several prompts
+    # per request, so reserialize only when a field actually changed
+    _json_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _json_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
     def completeness_score(self) -> float:
         """Return 0-1 score of how complete the profile is."""
         critical_fields = ['age', 'gender', 'state', 'occupation', 'category', 'annual_income']
@@ -33,10 +40,50 @@ class CitizenProfile:
         return filled / len(critical_fields)
 
     def to_dict(self) -> dict:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        # Read attributes directly — asdict() recurses and copies every field
+        result = {}
+        for name in _PROFILE_FIELD_NAMES:
+            value = getattr(self, name)
+            if value is not None:
+                result[name] = value
+        return result
+
+    def to_json(self) -> str:
+        """Profile as a JSON string, cached until a field changes.
+
+        The profile is mutable between turns (slots rule out
+        cached_property), so the cache is keyed on the tuple of current
+        field values.
+        """
+        key = tuple(getattr(self, name) for name in _PROFILE_FIELD_NAMES)
+        if key != self._json_key:
+            self._json_key = key
+            self._json_cache = orjson.dumps(self.to_dict()).decode()
+        return self._json_cache
+
+
+# Data fields only — the underscore cache slots never serialize
+_PROFILE_FIELD_NAMES = tuple(
+    f.name for f in fields(CitizenProfile) if not f.name.startswith("_")
+)
+
+
+# DynamoDB charges per KB and items are capped at 400KB — keep the stored
+# history to the newest messages that fit a ~8KB budget (max 20 either way)
+def _trim_messages(history: list, max_chars: int = 8000, max_messages: int = 20) -> list:
+    kept = []
+    total = 0
+    for msg in reversed(history):
+        size = len(msg.get("content", ""))
+        if kept and (total + size > max_chars or len(kept) >= max_messages):
+            break
+        kept.append(msg)
+        total += size
+    kept.reverse()
+    return kept
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Conversation session for a user."""
     session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -50,12 +97,16 @@ class Session:
     updated_at: float = field(default_factory=time.time)
 
     def add_message(self, role: str, content: str):
+        # Whole seconds are plenty for chat timestamps, and keeping the
+        # session all-int/str/bool means storage never needs a float/Decimal
+        # conversion walk
+        now = int(time.time())
         self.conversation_history.append({
             "role": role,
             "content": content,
-            "timestamp": time.time()
+            "timestamp": now
         })
-        self.updated_at = time.time()
+        self.updated_at = now
 
     def get_recent_history(self, n: int = 10) -> list:
         """Get last n messages for context."""
@@ -68,7 +119,7 @@ class Session:
             "language": self.language,
             "current_pillar": self.current_pillar,
             "profile": self.profile.to_dict(),
-            "conversation_history": self.conversation_history[-20:],  # Keep last 20
+            "conversation_history": _trim_messages(self.conversation_history),
             "matched_schemes": self.matched_schemes,
             "created_at": int(self.created_at),
             "updated_at": int(self.updated_at),
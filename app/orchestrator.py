@@ -4,12 +4,13 @@ Every message sends the FULL conversation history + user profile + scheme data
 to the AI model. The AI handles everything: intent detection, profile extraction,
 follow-up questions, scheme matching, and natural conversation — like ChatGPT.
 """
-import json
+import asyncio
+import re
+import orjson
 from app.models.schemas import Session, CitizenProfile
 from app.config import ENABLE_TTS
 from app.integrations.bedrock_client import invoke_model
 from app.integrations.language_client import translate_text, text_to_speech
-from app.services.scheme_matcher import match_schemes, explain_schemes_text
 
 
 # ── System prompt — the "brain" of LokSarthi ──
@@ -51,6 +52,19 @@ You MUST respond with valid JSON only:
 """
 
 
+# Pure greetings don't need the AI — answer locally and save a Bedrock RTT
+_GREETING_RE = re.compile(
+    r"^(?:namaste|namaskar|hello|hi+|hey+|helo|good\s*(?:morning|afternoon|evening)|"
+    r"नमस्ते|नमस्कार|हैलो|हाय|राम\s*राम|प्रणाम|start|शुरू)\s*(?:ji|जी)?[!।.,? ]*$",
+    re.IGNORECASE,
+)
+
+GREETING_REPLIES = {
+    "hi": "नमस्ते जी! मैं लोकसारथी हूँ। मैं सरकारी योजनाएँ खोजने, RTI आवेदन बनाने और पैसों की सलाह में आपकी मदद कर सकता हूँ। बताइए, आपको किस चीज़ में मदद चाहिए?",
+    "en": "Namaste! I am LokSarthi. I can help you discover government schemes, file RTI applications, and get financial advice. How can I help you today?",
+}
+
+
 def _build_context(session: Session) -> str:
     """Build context string with profile and matched schemes."""
     parts = []
@@ -58,33 +72,71 @@ def _build_context(session: Session) -> str:
     # User profile
     profile_data = session.profile.to_dict()
     if profile_data:
-        parts.append(f"USER PROFILE: {json.dumps(profile_data, ensure_ascii=False)}")
+        parts.append(f"USER PROFILE: {orjson.dumps(profile_data).decode()}")
     else:
         parts.append("USER PROFILE: (not yet collected)")
 
     # Matched schemes (if any)
     if session.matched_schemes:
-        parts.append(f"MATCHED SCHEMES: {json.dumps(session.matched_schemes[:5], ensure_ascii=False)}")
+        parts.append(f"MATCHED SCHEMES: {orjson.dumps(session.matched_schemes[:5]).decode()}")
 
     return "\n".join(parts)
 
 
-def process_message(session: Session, user_message: str) -> dict:
+async def process_message(session: Session, user_message: str) -> dict:
     """
     Process a user message through the AI agent.
     Sends full context to the model on every turn.
+
+    Blocking AWS calls run in threads; persisting the session is left to
+    the caller so it can happen after the response is sent.
     """
     # Add user message to history
     session.add_message("user", user_message)
 
     # Auto-detect language from user input
-    import re
     has_hindi = bool(re.search(r'[\u0900-\u097f]', user_message))
     if has_hindi:
         session.language = "hi"
     elif user_message.strip() and not has_hindi:
         session.language = "en"
 
+    # Fast path: pure greetings are answered locally \u2014 saves a full Bedrock RTT
+    if _GREETING_RE.match(user_message.strip()):
+        session.current_pillar = "greeting"
+        response_text = GREETING_REPLIES.get(session.language, GREETING_REPLIES["hi"])
+    else:
+        response_text = await _agent_reply(session, user_message)
+
+    # Log assistant response
+    session.add_message("assistant", response_text)
+
+    # Auto-detect response language for TTS
+    has_hindi_response = bool(re.search(r'[ऀ-ॿ]', response_text))
+    tts_lang = "hi" if has_hindi_response else "en"
+
+    # Generate audio (if TTS enabled) — the session save is deferred to a
+    # background task in the API layer so the response isn't blocked on it
+    audio_base64 = None
+    if ENABLE_TTS and len(response_text) < 500:
+        audio_base64 = await asyncio.to_thread(_tts_safe, response_text[:500], tts_lang)
+
+    return {
+        "text": response_text,
+        "audio_base64": audio_base64,
+        "language": session.language,
+        "pillar": session.current_pillar,
+        "schemes": session.matched_schemes,
+        "session": session,
+    }
+
+
+async def _agent_reply(session: Session, user_message: str) -> str:
+    """Full AI path — profile extraction, scheme matching, and the model call."""
+    # Imported here so greeting-only invocations never pay for loading the
+    # scheme catalog (keeps cold start lean)
+    from app.services.scheme_matcher import match_schemes
+
     # Extract profile from user message BEFORE calling AI (regex-based)
     _extract_profile_from_text(session.profile, user_message)
 
@@ -113,7 +165,7 @@ def process_message(session: Session, user_message: str) -> dict:
 
     try:
         # Single AI call with full context including schemes
-        raw_response = invoke_model(full_system, user_message, history[:-1])
+        raw_response = await asyncio.to_thread(invoke_model, full_system, user_message, history[:-1])
 
         # Parse JSON response
         parsed = _parse_ai_response(raw_response)
@@ -143,29 +195,16 @@ def process_message(session: Session, user_message: str) -> dict:
             "Sorry, something went wrong. Please try again."
         )
 
-    # Log assistant response
-    session.add_message("assistant", response_text)
+    return response_text
 
-    # Auto-detect response language for TTS
-    has_hindi_response = bool(re.search(r'[\u0900-\u097f]', response_text))
-    tts_lang = "hi" if has_hindi_response else "en"
 
-    # Generate audio (if TTS enabled)
-    audio_base64 = None
-    if ENABLE_TTS and len(response_text) < 500:
-        try:
-            audio_base64 = text_to_speech(response_text[:500], tts_lang)
-        except Exception as e:
-            print(f"TTS error: {e}")
-
-    return {
-        "text": response_text,
-        "audio_base64": audio_base64,
-        "language": session.language,
-        "pillar": session.current_pillar,
-        "schemes": session.matched_schemes,
-        "session": session,
-    }
+def _tts_safe(text: str, lang: str):
+    """text_to_speech that never raises — returns None on failure."""
+    try:
+        return text_to_speech(text, lang)
+    except Exception as e:
+        print(f"TTS error: {e}")
+        return None
 
 
 def _parse_ai_response(raw: str) -> dict:
@@ -174,8 +213,8 @@ def _parse_ai_response(raw: str) -> dict:
 
     # Try direct JSON parse
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
 
     # Try extracting JSON from markdown code block
@@ -184,8 +223,8 @@ def _parse_ai_response(raw: str) -> dict:
             json_str = text.split("```")[1]
             if json_str.startswith("json"):
                 json_str = json_str[4:]
-            return json.loads(json_str.strip())
-        except (json.JSONDecodeError, IndexError):
+            return orjson.loads(json_str.strip())
+        except (orjson.JSONDecodeError, IndexError):
             pass
 
     # Try finding JSON object in the text
@@ -193,8 +232,8 @@ def _parse_ai_response(raw: str) -> dict:
     end = text.rfind("}") + 1
     if start >= 0 and end > start:
         try:
-            return json.loads(text[start:end])
-        except json.JSONDecodeError:
+            return orjson.loads(text[start:end])
+        except orjson.JSONDecodeError:
             pass
 
     # Fallback: treat entire response as plain text reply
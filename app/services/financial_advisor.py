@@ -1,8 +1,16 @@
 """Financial Advisor — Loan calculator, fraud detection, and financial literacy."""
+import functools
 import json
+import math
+import re
 from app.integrations.bedrock_client import generate_response
 from app.models.schemas import CitizenProfile
 
+try:
+    import ahocorasick  # pyahocorasick — optional C extension
+except ImportError:
+    ahocorasick = None
+
 
 # Known scam patterns
 SCAM_PATTERNS = [
@@ -54,7 +62,10 @@ def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> d
         return {"error": "Invalid loan parameters"}
 
     monthly_rate = annual_rate / (12 * 100)
-    emi = principal * monthly_rate * (1 + monthly_rate)**tenure_months / ((1 + monthly_rate)**tenure_months - 1)
+    # (1+r)**n - 1 via expm1/log1p: one transcendental pair instead of two
+    # pow() calls, and numerically stable for small r*n
+    factor = math.expm1(tenure_months * math.log1p(monthly_rate))
+    emi = principal * monthly_rate * (1 + 1 / factor)
     total_payment = emi * tenure_months
     total_interest = total_payment - principal
     interest_percentage = (total_interest / principal) * 100
@@ -72,18 +83,74 @@ def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> d
     }
 
 
+# Single keyword -> owning-pattern-index table, built once at import.
+# Both scan paths hang off it: the automaton stores the index as each
+# word's value (so a hit carries its pattern id with no extra lookup)
+# and the regex fallback resolves its match through the same dict.
+_KW_TO_PATTERN = {kw: i for i, p in enumerate(SCAM_PATTERNS) for kw in p["keywords"]}
+
+
+# Multi-pattern scam scan: one Aho-Corasick automaton over all keywords,
+# built once at import — a single linear pass over the text instead of a
+# patterns × keywords substring loop per call
+def _build_scam_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, idx in _KW_TO_PATTERN.items():
+        automaton.add_word(keyword, idx)
+    automaton.make_automaton()
+    return automaton
+
+
+_SCAM_AUTOMATON = _build_scam_automaton()
+
+# Zero-dep fallback: a single compiled alternation over all keywords
+# (longest first so "share otp" wins over "otp") — one C-level regex scan
+# instead of nested Python loops
+_SCAM_RE = re.compile(
+    "|".join(sorted(map(re.escape, _KW_TO_PATTERN), key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
 def detect_scam(text: str) -> dict:
-    """Check if the described situation matches known scam patterns."""
-    text_lower = text.lower()
-
-    for pattern in SCAM_PATTERNS:
-        for keyword in pattern["keywords"]:
-            if keyword in text_lower:
-                return {
-                    "is_scam": True,
-                    "alert_hi": pattern["alert_hi"],
-                    "alert_en": pattern["alert_en"],
-                }
+    """Check if the described situation matches known scam patterns.
+
+    Retries and double-sent messages are common in chat, so results are
+    memoized on the whitespace-normalized text; callers treat the result
+    as read-only.
+    """
+    return _detect_scam_cached(" ".join(text.split()))
+
+
+@functools.lru_cache(maxsize=2048)
+def _detect_scam_cached(text: str) -> dict:
+    if _SCAM_AUTOMATON is not None:
+        # The automaton keys are lowercase, so this path still case-folds
+        # the input; iter_long() yields the longest match per position
+        # ("share otp" beats "otp") without re-checking shared prefixes,
+        # and end-offset order keeps the first hit deterministic
+        for _, idx in _SCAM_AUTOMATON.iter_long(text.lower()):
+            pattern = SCAM_PATTERNS[idx]
+            return {
+                "is_scam": True,
+                "alert_hi": pattern["alert_hi"],
+                "alert_en": pattern["alert_en"],
+            }
+        return {"is_scam": False}
+
+    # Fallback when pyahocorasick isn't installed — IGNORECASE scans the
+    # original text directly, so only the short matched keyword gets
+    # lowercased instead of the whole message
+    match = _SCAM_RE.search(text)
+    if match:
+        pattern = SCAM_PATTERNS[_KW_TO_PATTERN[match.group(0).lower()]]
+        return {
+            "is_scam": True,
+            "alert_hi": pattern["alert_hi"],
+            "alert_en": pattern["alert_en"],
+        }
 
     return {"is_scam": False}
 
@@ -113,28 +180,20 @@ def detect_predatory_lending(annual_rate: float) -> dict:
         }
 
 
-def handle_financial_query(user_message: str, profile: CitizenProfile, language: str = "hi") -> str:
-    """Main handler for financial queries."""
+# Static prompt pieces built once at import — only the profile JSON and
+# language vary per request
+_ALTERNATIVES_TEXT = "\n".join(
+    f"- {s['name']}: {s['rate']} interest, {s['amount']} — for {s['for']}"
+    for s in GOVT_LOAN_SCHEMES
+)
 
-    # Check for scam patterns first
-    scam_check = detect_scam(user_message)
-    if scam_check["is_scam"]:
-        alert = scam_check.get(f"alert_{language}", scam_check["alert_en"])
-        return alert
-
-    # Build context with government alternatives
-    alternatives_text = "\n".join([
-        f"- {s['name']}: {s['rate']} interest, {s['amount']} — for {s['for']}"
-        for s in GOVT_LOAN_SCHEMES
-    ])
+_FIN_PROMPT_TEMPLATE = """You are LokSarthi's Financial Advisor. Help the citizen with financial literacy.
 
-    system_prompt = f"""You are LokSarthi's Financial Advisor. Help the citizen with financial literacy.
-
-CITIZEN PROFILE: {json.dumps(profile.to_dict(), ensure_ascii=False)}
+CITIZEN PROFILE: {profile_json}
 LANGUAGE: {language}
 
 GOVERNMENT LOAN ALTERNATIVES (always mention these as better options):
-{alternatives_text}
+""" + _ALTERNATIVES_TEXT + """
 
 YOUR CAPABILITIES:
 1. **Loan Explanation**: If they mention a loan amount/rate, calculate EMI and explain in exact ₹ amounts
@@ -158,4 +217,18 @@ Example: If someone says "sahukar is offering 5% monthly rate on ₹50,000 loan"
 - Show how much they'd save with PM MUDRA at 8% instead
 - Guide them to apply for MUDRA loan"""
 
+
+def handle_financial_query(user_message: str, profile: CitizenProfile, language: str = "hi") -> str:
+    """Main handler for financial queries."""
+
+    # Check for scam patterns first
+    scam_check = detect_scam(user_message)
+    if scam_check["is_scam"]:
+        alert = scam_check.get(f"alert_{language}", scam_check["alert_en"])
+        return alert
+
+    system_prompt = _FIN_PROMPT_TEMPLATE.format(
+        profile_json=profile.to_json(),
+        language=language,
+    )
     return generate_response(system_prompt, user_message)
@@ -1,8 +1,19 @@
 """RTI Assistant — Generates RTI applications from plain-language complaints."""
+import asyncio
 import json
+import re
+import time
+from collections import Counter, OrderedDict
+from datetime import date
+from app.config import RTI_TEMPLATE_FAST_PATH
 from app.integrations.bedrock_client import generate_response
 from app.models.schemas import CitizenProfile
 
+try:
+    import ahocorasick  # pyahocorasick — optional C extension
+except ImportError:
+    ahocorasick = None
+
 
 # RTI templates for common issues
 RTI_TEMPLATES = {
@@ -97,8 +108,95 @@ RTI_TEMPLATES = {
 }
 
 
+# Keyword pre-classifier — most complaints name their subject outright
+# ("ration card", "pension", "bijli"), so a local keyword scan settles
+# them and only ambiguous text pays for a Bedrock round-trip
+_CATEGORY_KEYWORDS = {
+    "ration_card_delay": ["ration", "राशन", "rashan"],
+    "pension_delay": ["pension", "पेंशन", "vridha", "वृद्धा"],
+    "mgnrega_wage_delay": ["mgnrega", "मनरेगा", "नरेगा", "nrega", "wage", "majdoori", "मजदूरी"],
+    "electricity_issue": ["electricity", "bijli", "बिजली", "power cut", "transformer"],
+    "water_supply": ["water", "pani", "पानी", "जल", "nal", "नल", "handpump"],
+    "road_repair": ["road", "sadak", "सड़क", "pothole", "gaddha", "गड्ढा"],
+    "scheme_benefit_not_received": ["scheme", "yojana", "योजना", "benefit", "kist", "किस्त", "labh", "लाभ"],
+}
+
+
+# One automaton over every category keyword — a single linear pass scores
+# all categories at once and scales to many more without code change
+def _build_category_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for category, keywords in _CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, category)
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+# Zero-dep fallback: one compiled alternation per category
+_QUICK_CLASSIFY = [
+    (re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE), category)
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+]
+
+
+def _preclassify(text: str):
+    """Pick the keyword-dominant category, or None when nothing matches."""
+    text_lower = text.lower()
+    if _CATEGORY_AUTOMATON is not None:
+        hits = Counter(cat for _, cat in _CATEGORY_AUTOMATON.iter(text_lower))
+        if hits:
+            return hits.most_common(1)[0][0]
+        return None
+
+    for pattern, category in _QUICK_CLASSIFY:
+        if pattern.search(text_lower):
+            return category
+    return None
+
+
+# Bounded LRU of recent AI classifications keyed by normalized text —
+# resent/retried complaints skip the Bedrock round-trip for an hour
+_classify_cache: OrderedDict = OrderedDict()
+_CLASSIFY_CACHE_TTL = 3600.0
+_CLASSIFY_CACHE_MAX = 1024
+
+
 def classify_complaint(complaint_text: str) -> dict:
-    """Use AI to classify the complaint and extract key details."""
+    """Classify the complaint — keyword rules first, AI for the rest."""
+    category = _preclassify(complaint_text)
+    if category is not None:
+        return {
+            "category": category,
+            "department": RTI_TEMPLATES[category]["department"],
+            "issue_summary": complaint_text[:200],
+            "location": "",
+            "duration": "",
+            "previous_attempts": ""
+        }
+
+    key = " ".join(complaint_text.split()).lower()
+    now = time.monotonic()
+    cached = _classify_cache.get(key)
+    if cached is not None and cached[0] > now:
+        _classify_cache.move_to_end(key)
+        return dict(cached[1])
+
+    result = _classify_with_ai(complaint_text)
+
+    _classify_cache[key] = (now + _CLASSIFY_CACHE_TTL, result)
+    _classify_cache.move_to_end(key)
+    while len(_classify_cache) > _CLASSIFY_CACHE_MAX:
+        _classify_cache.popitem(last=False)
+    return dict(result)
+
+
+def _classify_with_ai(complaint_text: str) -> dict:
+    """Bedrock classification for complaints no keyword rule matches."""
     system_prompt = """You are an RTI expert for India. Analyze the citizen's complaint and classify it.
 
 Return ONLY valid JSON:
@@ -128,6 +226,53 @@ Return ONLY valid JSON:
         }
 
 
+def _render_template(template: dict, profile: CitizenProfile, classification: dict) -> str:
+    """Fill an RTI template locally — no AI call needed for known categories."""
+    address = f"{profile.district or '[District]'}, {profile.state or '[State]'}"
+    subject = classification.get("issue_summary") or "the issue described below"
+    questions = "\n".join(f"{i}. {q}" for i, q in enumerate(template["questions"], 1))
+
+    if profile.bpl_status:
+        fee_line = (
+            "I belong to Below Poverty Line category and am exempted from paying the fee "
+            "as per Section 7(5) of the RTI Act, 2005. A copy of my BPL certificate is enclosed."
+        )
+    else:
+        fee_line = f"I am enclosing the prescribed fee of {template['fee']} [payment mode]."
+
+    return f"""---
+**RTI APPLICATION**
+Under Section 6(1) of the Right to Information Act, 2005
+
+To,
+The Public Information Officer,
+{template['department']},
+[Address]
+
+Subject: Application seeking information under RTI Act, 2005 regarding {subject}
+
+Sir/Madam,
+
+I, [Name], resident of {address}, hereby seek the following information under the Right to Information Act, 2005:
+
+{questions}
+
+{fee_line}
+
+I request that the information be provided within the statutory period of 30 days.
+
+Yours faithfully,
+[Name]
+{address}
+[Phone]
+Date: {date.today().strftime('%d-%m-%Y')}
+
+Enclosures:
+1. Fee payment proof / BPL certificate
+2. [Any relevant document copies]
+---"""
+
+
 def generate_rti_application(complaint_text: str, profile: CitizenProfile) -> str:
     """Generate a formal RTI application from a plain-language complaint."""
 
@@ -136,7 +281,13 @@ def generate_rti_application(complaint_text: str, profile: CitizenProfile) -> st
     category = classification.get("category", "general")
     template = RTI_TEMPLATES.get(category, RTI_TEMPLATES["general"])
 
-    # Step 2: Generate the formal RTI application using AI
+    # Step 2a: Templated categories already carry a complete skeleton —
+    # fill it locally and skip the second Bedrock round-trip. Only
+    # "general" complaints need AI drafting.
+    if RTI_TEMPLATE_FAST_PATH and category != "general" and category in RTI_TEMPLATES:
+        return _render_template(template, profile, classification) + _submission_instructions(template)
+
+    # Step 2b: Generate the formal RTI application using AI
     system_prompt = f"""You are an expert RTI application drafter for India.
 
 COMPLAINT: {complaint_text}
@@ -190,9 +341,12 @@ Make the questions SPECIFIC to the citizen's actual complaint, not generic. Incl
 Respond in English (the RTI application should be in English as it's a legal document)."""
 
     rti_text = generate_response(system_prompt, complaint_text)
+    return rti_text + _submission_instructions(template)
 
-    # Add submission instructions
-    instructions = f"""
+
+def _submission_instructions(template: dict) -> str:
+    """Submission instructions appended to every generated application."""
+    return f"""
 
 📋 **HOW TO SUBMIT THIS RTI:**
 
@@ -208,16 +362,23 @@ Department: {template['department']}
 PIO: {template['pio']}
 """
 
-    return rti_text + instructions
 
+_EXPLANATION_PROMPT_TEMPLATE = """Explain to the citizen in {language} language (use simple words):
+1. You have created an RTI application for them
+2. Their complaint is about: [summarize briefly]
+3. They need to submit it to [department]
+4. It will cost ₹10 (free for BPL)
+5. They will get a response in 30 days
+6. Ask if they want to modify anything
+
+Keep it warm, encouraging, and simple. Use phrases like "Aapki RTI tayyar hai!" """
 
-def handle_rti_request(user_message: str, profile: CitizenProfile, language: str = "hi") -> str:
-    """Main handler for RTI-related requests."""
 
-    system_prompt = f"""You are LokSarthi's RTI Assistant. The citizen wants to file an RTI or grievance.
+def _guidance_prompt(user_message: str, profile: CitizenProfile, language: str) -> str:
+    return f"""You are LokSarthi's RTI Assistant. The citizen wants to file an RTI or grievance.
 
 CITIZEN'S MESSAGE: {user_message}
-CITIZEN PROFILE: {json.dumps(profile.to_dict(), ensure_ascii=False)}
+CITIZEN PROFILE: {profile.to_json()}
 
 Determine what the citizen needs:
 1. If they have a clear complaint → Generate the RTI application
@@ -227,22 +388,38 @@ Determine what the citizen needs:
 Respond in the citizen's language ({language}). Be empathetic and encouraging.
 If generating an RTI, also explain in simple language what you've done and next steps."""
 
+
+def handle_rti_request(user_message: str, profile: CitizenProfile, language: str = "hi") -> str:
+    """Main handler for RTI-related requests."""
     # Check if we have enough info to generate an RTI
     if len(user_message.split()) > 10:  # Substantial complaint
         rti_application = generate_rti_application(user_message, profile)
 
         # Generate a simple explanation in the user's language
-        explanation_prompt = f"""Explain to the citizen in {language} language (use simple words):
-1. You have created an RTI application for them
-2. Their complaint is about: [summarize briefly]
-3. They need to submit it to [department]
-4. It will cost ₹10 (free for BPL)
-5. They will get a response in 30 days
-6. Ask if they want to modify anything
-
-Keep it warm, encouraging, and simple. Use phrases like "Aapki RTI tayyar hai!" """
-
+        explanation_prompt = _EXPLANATION_PROMPT_TEMPLATE.format(language=language)
         explanation = generate_response(explanation_prompt, user_message)
-        return explanation + "\n\n" + rti_application
+        return "\n\n".join((explanation, rti_application))
+
+    return generate_response(_guidance_prompt(user_message, profile, language), user_message)
+
+
+async def handle_rti_request_stream(user_message: str, profile: CitizenProfile, language: str = "hi"):
+    """Streaming variant of handle_rti_request.
+
+    Yields the explanation first so the client sees text after one LLM
+    round-trip; the application itself is drafted concurrently in a
+    worker thread and yielded when ready, instead of paying for both
+    calls back-to-back before the first byte goes out.
+    """
+    if len(user_message.split()) > 10:
+        application_task = asyncio.ensure_future(
+            asyncio.to_thread(generate_rti_application, user_message, profile)
+        )
+        explanation_prompt = _EXPLANATION_PROMPT_TEMPLATE.format(language=language)
+        yield await asyncio.to_thread(generate_response, explanation_prompt, user_message)
+        yield "\n\n"
+        yield await application_task
     else:
-        return generate_response(system_prompt, user_message)
+        yield await asyncio.to_thread(
+            generate_response, _guidance_prompt(user_message, profile, language), user_message
+        )
@@ -1,106 +1,156 @@
 """Scheme Matcher — Matches citizen profiles against government schemes."""
+import heapq
 import json
 import os
+from dataclasses import dataclass
 from typing import Optional
 from app.models.schemas import CitizenProfile
-from app.integrations.bedrock_client import generate_response
-
-# Load schemes data at module level (reused across invocations)
-_schemes = None
-
-
-def _load_schemes() -> list:
-    global _schemes
-    if _schemes is None:
-        data_path = os.path.join(os.path.dirname(__file__), "..", "data", "schemes", "central_schemes.json")
-        with open(data_path, "r", encoding="utf-8") as f:
-            _schemes = json.load(f)
-    return _schemes
-
-
-def _passes_filter(profile: CitizenProfile, rules: dict) -> bool:
-    """Check if a citizen passes the hard eligibility filters for a scheme."""
-
-    # Age filter
-    if "age_min" in rules and profile.age is not None:
-        if profile.age < rules["age_min"]:
-            return False
-    if "age_max" in rules and profile.age is not None:
-        if profile.age > rules["age_max"]:
-            return False
-
-    # Gender filter
-    if "gender" in rules and profile.gender is not None:
-        if profile.gender not in rules["gender"]:
-            return False
-
-    # State filter
-    if "states" in rules and profile.state is not None:
-        if profile.state.lower() not in [s.lower() for s in rules["states"]]:
-            return False
-
-    # Occupation filter
-    if "occupations" in rules and profile.occupation is not None:
-        if profile.occupation not in rules["occupations"]:
-            return False
-
-    # Category filter
-    if "categories" in rules and profile.category is not None:
-        if profile.category not in rules["categories"]:
-            return False
-
-    # Income filter
-    if "income_max" in rules and profile.annual_income is not None:
-        if profile.annual_income > rules["income_max"]:
-            return False
-
-    # BPL filter
-    if rules.get("bpl_required") and profile.bpl_status is not None:
-        if not profile.bpl_status:
-            return False
 
-    # Disability filter
-    if rules.get("disability_required") or rules.get("disability"):
-        if profile.disability is not None and not profile.disability:
-            return False
+@dataclass(slots=True)
+class Rule:
+    """Filter-ready eligibility record for one scheme.
 
-    # Land ownership filter
-    if rules.get("land_required") and profile.land_ownership is not None:
-        if not profile.land_ownership:
-            return False
+    Slotted attribute access in the hot kernel replaces string-keyed
+    dict lookups, and the fixed layout keeps the 40-record sweep compact.
+    Categorical constraints are int bitmasks over the id tables below;
+    mask 0 means the field is unconstrained.
+    """
+    age_min: int = 0
+    age_max: int = 200
+    income_max: float = float("inf")
+    gender_mask: int = 0
+    states_mask: int = 0
+    occupations_mask: int = 0
+    categories_mask: int = 0
+    marital_mask: int = 0
+    bpl_required: bool = False
+    disability_required: bool = False
+    land_required: bool = False
+    high_benefit: bool = False
+
+
+# Value -> bit-index tables, populated from the catalog as rules are
+# prepared. A rule's mask ORs the bits of its allowed values; a profile
+# value maps to a single bit, so each membership test is one integer AND.
+_GENDER_ID: dict = {}
+_STATE_ID: dict = {}
+_OCCUPATION_ID: dict = {}
+_CATEGORY_ID: dict = {}
+_MARITAL_ID: dict = {}
+
+
+def _rule_mask(table: dict, values, lower: bool = False) -> int:
+    """OR the id bits of `values` into one mask (0 = unconstrained)."""
+    if values is None:
+        return 0
+    mask = 0
+    for v in values:
+        if lower:
+            v = v.lower()
+        mask |= 1 << table.setdefault(v, len(table))
+    return mask
+
+
+def _profile_bit(table: dict, value) -> int:
+    """Single bit for a profile value; 0 if unset or unknown to the catalog."""
+    idx = table.get(value)
+    return 0 if idx is None else 1 << idx
+
+
+def _prepare_rules(scheme: dict) -> Rule:
+    """Normalize a scheme's eligibility into a filter-ready Rule.
+
+    Numeric bounds get sentinel defaults and flag variants are collapsed,
+    so the per-request filter loop does plain comparisons instead of
+    key-presence checks on the raw eligibility dicts.
+    """
+    rules = scheme.get("eligibility", {})
+    benefit = scheme.get("benefit_amount", "")
+    return Rule(
+        age_min=rules.get("age_min", 0),
+        age_max=rules.get("age_max", 200),
+        income_max=rules.get("income_max", float("inf")),
+        gender_mask=_rule_mask(_GENDER_ID, rules.get("gender")),
+        states_mask=_rule_mask(_STATE_ID, rules.get("states"), lower=True),
+        occupations_mask=_rule_mask(_OCCUPATION_ID, rules.get("occupations")),
+        categories_mask=_rule_mask(_CATEGORY_ID, rules.get("categories")),
+        marital_mask=_rule_mask(_MARITAL_ID, rules.get("marital_status")),
+        bpl_required=bool(rules.get("bpl_required")),
+        disability_required=bool(rules.get("disability_required") or rules.get("disability")),
+        land_required=bool(rules.get("land_required")),
+        high_benefit="lakh" in benefit.lower() or "₹5,00,000" in benefit,
+    )
+
+
+# Catalog loaded and prepared once at module import. The import lock makes
+# this atomic under concurrent workers — no double-checked-init race like
+# the old lazy global, and this module is itself imported lazily by the
+# orchestrator so cold starts don't pay for it up front.
+_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "schemes", "central_schemes.json")
+with open(_DATA_PATH, "r", encoding="utf-8") as _f:
+    _SCHEMES: list = json.load(_f)
+_PREPARED: list = [_prepare_rules(s) for s in _SCHEMES]
+
+
+def _filter_and_score(profile: CitizenProfile, rule: Rule,
+                      gender_bit: int, state_bit: int, occ_bit: int,
+                      cat_bit: int, marital_bit: int):
+    """Single-pass eligibility filter + relevance score for one scheme.
+
+    Each categorical field is looked at exactly once: a mismatch rejects
+    the scheme (returns None), a match adds its relevance bonus. The
+    *_bit arguments are the profile's id bits, computed once per
+    match_schemes call; a set value unknown to the catalog carries bit 0
+    and so fails every constrained scheme, same as the old set lookups.
+    """
+    score = 50  # Base score for passing filters
 
-    # Marital status filter
-    if "marital_status" in rules and profile.marital_status is not None:
-        if profile.marital_status not in rules["marital_status"]:
-            return False
+    if profile.age is not None:
+        if not (rule.age_min <= profile.age <= rule.age_max):
+            return None
 
-    return True
+    if rule.gender_mask and profile.gender is not None:
+        if not rule.gender_mask & gender_bit:
+            return None
+        score += 10
 
+    if rule.states_mask and profile.state is not None:
+        if not rule.states_mask & state_bit:
+            return None
 
-def _relevance_score(profile: CitizenProfile, scheme: dict) -> float:
-    """Calculate relevance score (0-100) for a scheme based on profile match."""
-    score = 50  # Base score for passing filters
-    rules = scheme.get("eligibility", {})
-
-    # Bonus for specific matches
-    if "occupations" in rules and profile.occupation:
-        if profile.occupation in rules["occupations"]:
-            score += 15
+    if rule.occupations_mask and profile.occupation is not None:
+        if not rule.occupations_mask & occ_bit:
+            return None
+        score += 15
 
-    if "categories" in rules and profile.category:
-        if profile.category in rules["categories"]:
-            score += 10
+    if rule.categories_mask and profile.category is not None:
+        if not rule.categories_mask & cat_bit:
+            return None
+        score += 10
 
-    if "gender" in rules and profile.gender:
-        if profile.gender in rules["gender"]:
-            score += 10
+    if profile.annual_income is not None:
+        if profile.annual_income > rule.income_max:
+            return None
 
-    if rules.get("bpl_required") and profile.bpl_status:
+    if rule.bpl_required and profile.bpl_status is not None:
+        if not profile.bpl_status:
+            return None
         score += 10
 
-    # Bonus for high-value benefits
-    benefit = scheme.get("benefit_amount", "")
-    if "lakh" in benefit.lower() or "₹5,00,000" in benefit:
+    if rule.disability_required:
+        if profile.disability is not None and not profile.disability:
+            return None
+
+    if rule.land_required and profile.land_ownership is not None:
+        if not profile.land_ownership:
+            return None
+
+    if rule.marital_mask and profile.marital_status is not None:
+        if not rule.marital_mask & marital_bit:
+            return None
+
+    # Bonus for high-value benefits — flag precomputed at load
+    if rule.high_benefit:
         score += 5
 
     return min(score, 100)
@@ -113,23 +163,25 @@ def match_schemes(profile: CitizenProfile, max_results: int = 7) -> list:
     Returns:
         List of {scheme, score, reason} sorted by relevance
     """
-    schemes = _load_schemes()
     matches = []
 
-    for scheme in schemes:
-        rules = scheme.get("eligibility", {})
+    # Encode the profile's categorical fields once per call — the profile
+    # is mutable between turns, so bits can't live on the dataclass
+    gender_bit = _profile_bit(_GENDER_ID, profile.gender)
+    state_bit = _profile_bit(_STATE_ID, profile.state.lower() if profile.state is not None else None)
+    occ_bit = _profile_bit(_OCCUPATION_ID, profile.occupation)
+    cat_bit = _profile_bit(_CATEGORY_ID, profile.category)
+    marital_bit = _profile_bit(_MARITAL_ID, profile.marital_status)
 
-        # Empty eligibility = universal scheme, everyone eligible
-        if not rules or _passes_filter(profile, rules):
-            score = _relevance_score(profile, scheme)
-            matches.append({
-                "scheme": scheme,
-                "score": score,
-            })
+    for scheme, rule in zip(_SCHEMES, _PREPARED):
+        # Prepared defaults make empty eligibility pass automatically
+        score = _filter_and_score(profile, rule,
+                                  gender_bit, state_bit, occ_bit, cat_bit, marital_bit)
+        if score is not None:
+            matches.append({"scheme": scheme, "score": score})
 
-    # Sort by score descending
-    matches.sort(key=lambda m: m["score"], reverse=True)
-    return matches[:max_results]
+    # Top-k by score — O(N log k) instead of sorting the full match list
+    return heapq.nlargest(max_results, matches, key=lambda m: m["score"])
 
 
 def get_profiling_question(profile: CitizenProfile) -> Optional[str]:
@@ -186,7 +238,7 @@ def explain_schemes(matched_schemes: list, profile: CitizenProfile, language: st
     system_prompt = f"""You are LokSarthi, a warm and caring AI assistant helping Indian citizens discover government schemes.
 
 CITIZEN PROFILE:
-{json.dumps(profile.to_dict(), ensure_ascii=False)}
+{profile.to_json()}
 
 MATCHED SCHEMES (ranked by relevance):
 {context_data}
@@ -201,6 +253,9 @@ INSTRUCTIONS:
 7. At the end, ask if they want more details about any specific scheme
 8. Mention that you can also help with RTI applications and financial advice"""
 
+    # Imported here so matching alone never pulls in the Bedrock client —
+    # only the AI-explanation path pays for it
+    from app.integrations.bedrock_client import generate_response
     return generate_response(system_prompt, f"Please explain my eligible schemes. My language is: {language}")
 
 